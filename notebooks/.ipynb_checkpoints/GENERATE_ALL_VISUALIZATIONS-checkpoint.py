@@ -1,17 +1,35 @@
 # ============================================================================
 # COMPREHENSIVE VISUALIZATION GENERATION
-# Run this in a new notebook or at end of Notebook 4
+# Run as a script: python GENERATE_ALL_VISUALIZATIONS.py
+# (figures render in parallel worker processes). From a notebook, import the
+# module and call run_all(max_workers=1) to render serially in-process.
 # Creates ALL visualizations for the website
 # ============================================================================
 
+import matplotlib
+matplotlib.use('Agg')  # figures are only saved to disk, never shown
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.colors import ListedColormap, Normalize
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
 import seaborn as sns
 import geopandas as gpd
+import shapely
 import pandas as pd
 import numpy as np
+import os
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import pyarrow.parquet as pq
+import requests
 import contextily as cx
+import datashader as ds
+import datashader.transfer_functions as tf
+import numba
+from lonboard import Map, PathLayer
+from lonboard.colormap import apply_continuous_cmap
 
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
@@ -21,20 +39,29 @@ sns.set_palette("husl")
 output_dir = Path('outputs/figures')
 output_dir.mkdir(parents=True, exist_ok=True)
 
-print("🎨 Generating comprehensive visualizations...")
+# PREVIEW=1 for fast iteration: half resolution and no second tight-bbox pass
+PREVIEW = os.getenv('PREVIEW', '').lower() in ('1', 'true', 'yes')
+SAVE_KWARGS = {'dpi': 150} if PREVIEW else {'dpi': 300, 'bbox_inches': 'tight'}
 
-# ============================================================================
-# VISUALIZATION 1: Network-Wide Shade Heatmap
-# ============================================================================
-
-print("\n1. Creating network shade heatmap...")
+# Probe the tile server once; offline runs skip basemaps instead of timing out per axes.
+# Worker processes (spawn/forkserver re-import this module) reuse the parent's result.
+if 'SHADE_HAVE_BASEMAP' in os.environ:
+    HAVE_BASEMAP = os.environ['SHADE_HAVE_BASEMAP'] == '1'
+else:
+    try:
+        requests.head('https://basemaps.cartocdn.com', timeout=1)
+        HAVE_BASEMAP = True
+    except requests.RequestException:
+        HAVE_BASEMAP = False
+        print("⚠️  Basemap tiles unreachable - maps will be drawn without a basemap")
+    os.environ['SHADE_HAVE_BASEMAP'] = '1' if HAVE_BASEMAP else '0'
 
-# Load the shade network
-edges = gpd.read_file('data/processed/network_edges_with_shade.geojson')
+# Stitched basemap mosaic, persisted so every worker process reuses it
+BASEMAP_CACHE = Path('data/processed/basemap_positron.npz')
 
-# Create figure with 2x4 subplots for all scenarios
-fig, axes = plt.subplots(2, 4, figsize=(20, 10))
-fig.suptitle('Network Shade Coverage Across All Scenarios', fontsize=16, fontweight='bold')
+# Shade network (GeoParquet written by Notebook 2; converted from the GeoJSON if missing)
+EDGES_PATH = 'data/processed/network_edges_with_shade.parquet'
+EDGES_GEOJSON_PATH = 'data/processed/network_edges_with_shade.geojson'
 
 scenarios = [
     ('shade_summer_morning', 'Summer Morning (7 AM)'),
@@ -46,424 +73,622 @@ scenarios = [
     ('shade_spring_midday', 'Spring Midday (12 PM)'),
     ('shade_fall_midday', 'Fall Midday (12 PM)')
 ]
+scenario_cols = [c for c, _ in scenarios]
+shadow_cols = [f'{kind}_shadow_{c[len("shade_"):]}'
+               for c in scenario_cols for kind in ('building', 'tree')]
+
+
+def ensure_edges_parquet():
+    """One-time conversion of the shade network GeoJSON to GeoParquet."""
+    if not os.path.exists(EDGES_PATH):
+        print(f"Converting {EDGES_GEOJSON_PATH} to GeoParquet (one time)...")
+        gpd.read_file(EDGES_GEOJSON_PATH).to_parquet(EDGES_PATH)
+
+
+def load_edges(columns=()):
+    """Load geometry plus the requested columns and project to Web Mercator."""
+    # Column projection at read time: only the attributes a figure uses are
+    # decoded. Requested columns missing from the file are skipped.
+    available = set(pq.read_schema(EDGES_PATH).names)
+    columns = ['geometry'] + [c for c in columns if c in available]
+    edges = gpd.read_parquet(EDGES_PATH, columns=columns)
+
+    # Shade fractions are in [0, 1]; float32 is plenty and halves memory traffic
+    shade_cols = edges.filter(regex='(shade|shadow)_').columns
+    edges[shade_cols] = edges[shade_cols].astype(np.float32)
+
+    return edges.to_crs(3857)
+
+
+def total_miles(edges):
+    """Total network length in miles, from the OSMnx `length` column (meters) when present."""
+    if 'length' in edges.columns:
+        return float(edges['length'].sum()) / 1609.344
+    # Web Mercator lengths are inflated away from the equator; measure in PA state plane (ft)
+    return float(edges.geometry.to_crs(2272).length.sum()) / 5280.0
+
+
+def plot_edges(ax, edges, colors, **kwargs):
+    """Draw every edge as one LineCollection; `colors` is one color or one per edge."""
+    # Explode multi-part lines, then split one vectorized coordinate dump into segments
+    parts, owner = shapely.get_parts(edges.geometry.values, return_index=True)
+    xy, part = shapely.get_coordinates(parts, return_index=True)
+    segments = np.split(xy, np.cumsum(np.bincount(part, minlength=len(parts)))[:-1])
+    if np.ndim(colors) == 2:
+        colors = np.asarray(colors)[owner]
+
+    ax.add_collection(LineCollection(segments, colors=colors, **kwargs))
+    ax.autoscale_view()
+    ax.set_aspect('equal')
+
+
+@lru_cache(maxsize=None)
+def basemap_tiles(bounds):
+    """Fetch and stitch the CartoDB Positron tiles covering `bounds` (EPSG:3857)."""
+    if BASEMAP_CACHE.exists():
+        with np.load(BASEMAP_CACHE) as npz:
+            if tuple(npz['bounds']) == bounds:
+                return npz['img'], tuple(npz['extent'])
+
+    img, extent = cx.bounds2img(*bounds, source=cx.providers.CartoDB.Positron)
+    # Write to a per-process temp file and swap it in, so readers never see a partial file
+    tmp_path = BASEMAP_CACHE.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as fh:
+        np.savez(fh, img=img, extent=extent, bounds=bounds)
+    os.replace(tmp_path, BASEMAP_CACHE)
+    return img, extent
+
+
+def add_basemap(ax, bounds, alpha=1.0):
+    """Draw the cached tile mosaic under the data without changing the view."""
+    img, extent = basemap_tiles(tuple(float(b) for b in bounds))
+    limits = ax.axis()
+    ax.imshow(img, extent=extent, alpha=alpha, zorder=0)
+    ax.axis(limits)
+
+
+# cache=True: viz3/viz4/viz8 run in separate workers, which load the compiled
+# kernel from disk instead of each JIT-compiling it. Serial, since the worker
+# pool already occupies the cores.
+@numba.njit(cache=True)
+def column_summary(X):
+    """Per-column NaN-skipping mean and % of rows >0.5, in one pass."""
+    n, k = X.shape
+    means = np.zeros(k)
+    high_pct = np.zeros(k)
+    for j in range(k):
+        total = 0.0
+        count = 0
+        high = 0
+        for i in range(n):
+            v = X[i, j]
+            if not np.isnan(v):
+                total += v
+                count += 1
+                if v > 0.5:
+                    high += 1
+        means[j] = total / count if count > 0 else np.nan
+        high_pct[j] = high / n * 100 if n > 0 else np.nan
+    return means, high_pct
+
+
+def scenario_stats(edges):
+    """Mean shade and % of segments >50% shaded for each scenario."""
+    cols = [c for c, _ in scenarios if c in edges.columns]
+    titles = [t for c, t in scenarios if c in edges.columns]
+    means, high_pct = column_summary(edges[cols].to_numpy(dtype=np.float32))
+
+    return pd.DataFrame({
+        'scenario': [t.replace(' (', '\n(') for t in titles],
+        'mean': means,
+        'high_shade_pct': high_pct
+    })
+
+
+def shade_contributions(edges):
+    """Mean building and tree shadow coverage for each scenario."""
+    scenario_names = [s for s in (c[len('shade_'):] for c in scenario_cols)
+                      if f'building_shadow_{s}' in edges.columns
+                      and f'tree_shadow_{s}' in edges.columns]
+
+    # One pass over all building/tree columns, then reshape to (scenario, source)
+    all_cols = [f'{kind}_shadow_{s}' for s in scenario_names for kind in ('building', 'tree')]
+    means, _ = column_summary(edges[all_cols].to_numpy(dtype=np.float32))
+    means = means.reshape(len(scenario_names), 2)
+
+    return pd.DataFrame({
+        'scenario': [s.replace('_', ' ').title() for s in scenario_names],
+        'building': means[:, 0],
+        'tree': means[:, 1]
+    })
 
-for idx, (col, title) in enumerate(scenarios):
-    ax = axes[idx // 4, idx % 4]
-    
-    if col in edges.columns:
-        edges.plot(column=col, ax=ax, legend=True, cmap='RdYlGn',
-                   vmin=0, vmax=1, linewidth=0.5, 
-                   legend_kwds={'label': 'Shade Coverage', 'shrink': 0.5})
-        ax.set_title(title, fontsize=11, fontweight='bold')
-        ax.axis('off')
-        
-        # Add basemap
-        try:
-            cx.add_basemap(ax, crs=edges.crs, source=cx.providers.CartoDB.Positron, alpha=0.3)
-        except:
-            pass
-    else:
-        ax.text(0.5, 0.5, 'Data not available', ha='center', va='center')
-        ax.set_title(title, fontsize=11)
-        ax.axis('off')
 
-plt.tight_layout()
-plt.savefig(output_dir / 'shade_heatmap_all_scenarios.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: shade_heatmap_all_scenarios.png")
-plt.close()
+# ============================================================================
+# VISUALIZATION 1: Network-Wide Shade Heatmap
+# ============================================================================
+
+def make_viz1():
+    print("\n1. Creating network shade heatmap...")
+
+    edges = load_edges(scenario_cols)
+
+    # Create figure with 2x4 subplots for all scenarios
+    fig, axes = plt.subplots(2, 4, figsize=(20, 10))
+    fig.suptitle('Network Shade Coverage Across All Scenarios', fontsize=16, fontweight='bold')
+
+    # Rasterize the network with datashader (one canvas shared by all panels)
+    xmin, ymin, xmax, ymax = edges.total_bounds
+    canvas = ds.Canvas(plot_width=600, plot_height=int(600 * (ymax - ymin) / (xmax - xmin)),
+                       x_range=(xmin, xmax), y_range=(ymin, ymax))
+    extent = (xmin, xmax, ymin, ymax)
+    shade_norm = Normalize(vmin=0, vmax=1)
+
+    for idx, (col, title) in enumerate(scenarios):
+        ax = axes[idx // 4, idx % 4]
+
+        if col in edges.columns:
+            agg = canvas.line(edges, geometry='geometry', agg=ds.mean(col))
+            img = tf.shade(agg, cmap=plt.cm.RdYlGn, how='linear', span=[0, 1])
+            # zorder 1 keeps the shade raster above the basemap (zorder 0)
+            ax.imshow(np.asarray(img.to_pil()), extent=extent, interpolation='nearest', zorder=1)
+            fig.colorbar(ScalarMappable(norm=shade_norm, cmap='RdYlGn'), ax=ax,
+                         label='Shade Coverage', shrink=0.5)
+            ax.set_title(title, fontsize=11, fontweight='bold')
+            ax.axis('off')
+
+            # Add basemap
+            if HAVE_BASEMAP:
+                add_basemap(ax, edges.total_bounds, alpha=0.3)
+        else:
+            ax.text(0.5, 0.5, 'Data not available', ha='center', va='center')
+            ax.set_title(title, fontsize=11)
+            ax.axis('off')
+
+    plt.tight_layout()
+    plt.savefig(output_dir / 'shade_heatmap_all_scenarios.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: shade_heatmap_all_scenarios.png")
+    plt.close()
+
+    # Interactive companions: one GPU-rendered (deck.gl) map per scenario.
+    # The static HTML has no layer control, so scenarios are separate files.
+    edges_wgs84 = edges.to_crs(4326)
+    for col, _ in scenarios:
+        if col in edges_wgs84.columns:
+            layer = PathLayer.from_geopandas(
+                edges_wgs84[['geometry', col]],
+                get_color=apply_continuous_cmap(edges_wgs84[col].fillna(0).to_numpy(), plt.cm.RdYlGn),
+                width_min_pixels=1
+            )
+            filename = f'shade_network_{col[len("shade_"):]}.html'
+            Map(layers=[layer]).to_html(output_dir / filename)
+            print(f"  ✓ Saved: {filename}")
+
 
 # ============================================================================
 # VISUALIZATION 2: Shade Distribution Histograms
 # ============================================================================
 
-print("\n2. Creating shade distribution histograms...")
-
-fig, axes = plt.subplots(2, 4, figsize=(20, 10))
-fig.suptitle('Shade Score Distributions by Scenario', fontsize=16, fontweight='bold')
-
-for idx, (col, title) in enumerate(scenarios):
-    ax = axes[idx // 4, idx % 4]
-    
-    if col in edges.columns:
-        data = edges[col].dropna()
-        ax.hist(data, bins=50, color='skyblue', edgecolor='black', alpha=0.7)
-        ax.axvline(data.mean(), color='red', linestyle='--', linewidth=2, label=f'Mean: {data.mean():.2f}')
-        ax.axvline(data.median(), color='green', linestyle='--', linewidth=2, label=f'Median: {data.median():.2f}')
-        ax.set_xlabel('Shade Coverage', fontsize=10)
-        ax.set_ylabel('Number of Segments', fontsize=10)
-        ax.set_title(title, fontsize=11, fontweight='bold')
-        ax.legend(fontsize=8)
-        ax.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig(output_dir / 'shade_distributions.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: shade_distributions.png")
-plt.close()
+def make_viz2():
+    print("\n2. Creating shade distribution histograms...")
+
+    edges = load_edges(scenario_cols)
+
+    fig, axes = plt.subplots(2, 4, figsize=(20, 10))
+    fig.suptitle('Shade Score Distributions by Scenario', fontsize=16, fontweight='bold')
+
+    for idx, (col, title) in enumerate(scenarios):
+        ax = axes[idx // 4, idx % 4]
+
+        if col in edges.columns:
+            data = edges[col].dropna()
+            ax.hist(data, bins=50, color='skyblue', edgecolor='black', alpha=0.7)
+            ax.axvline(data.mean(), color='red', linestyle='--', linewidth=2, label=f'Mean: {data.mean():.2f}')
+            ax.axvline(data.median(), color='green', linestyle='--', linewidth=2, label=f'Median: {data.median():.2f}')
+            ax.set_xlabel('Shade Coverage', fontsize=10)
+            ax.set_ylabel('Number of Segments', fontsize=10)
+            ax.set_title(title, fontsize=11, fontweight='bold')
+            ax.legend(fontsize=8)
+            ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(output_dir / 'shade_distributions.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: shade_distributions.png")
+    plt.close()
+
 
 # ============================================================================
 # VISUALIZATION 3: Temporal Comparison Bar Chart
 # ============================================================================
 
-print("\n3. Creating temporal comparison chart...")
-
-# Calculate statistics
-stats = []
-for col, title in scenarios:
-    if col in edges.columns:
-        data = edges[col]
-        stats.append({
-            'scenario': title.replace(' (', '\n('),
-            'mean': data.mean(),
-            'high_shade_pct': (data > 0.5).sum() / len(data) * 100
-        })
-
-stats_df = pd.DataFrame(stats)
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-fig.suptitle('Temporal Variation in Shade Availability', fontsize=16, fontweight='bold')
-
-# Mean shade by scenario
-bars1 = ax1.bar(range(len(stats_df)), stats_df['mean'], 
-                color=['#d32f2f', '#f57c00', '#fbc02d', '#689f38', 
-                       '#388e3c', '#1976d2', '#7b1fa2', '#c2185b'])
-ax1.set_xticks(range(len(stats_df)))
-ax1.set_xticklabels(stats_df['scenario'], rotation=45, ha='right', fontsize=9)
-ax1.set_ylabel('Mean Shade Coverage', fontsize=12)
-ax1.set_title('Average Shade Coverage by Scenario', fontsize=12, fontweight='bold')
-ax1.grid(axis='y', alpha=0.3)
-ax1.set_ylim(0, 1)
-
-# Add value labels
-for i, (bar, val) in enumerate(zip(bars1, stats_df['mean'])):
-    ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.02, 
-             f'{val:.1%}', ha='center', va='bottom', fontsize=9, fontweight='bold')
-
-# High-shade percentage
-bars2 = ax2.bar(range(len(stats_df)), stats_df['high_shade_pct'],
-                color=['#d32f2f', '#f57c00', '#fbc02d', '#689f38', 
-                       '#388e3c', '#1976d2', '#7b1fa2', '#c2185b'])
-ax2.set_xticks(range(len(stats_df)))
-ax2.set_xticklabels(stats_df['scenario'], rotation=45, ha='right', fontsize=9)
-ax2.set_ylabel('Percentage of Segments', fontsize=12)
-ax2.set_title('Segments with >50% Shade', fontsize=12, fontweight='bold')
-ax2.grid(axis='y', alpha=0.3)
-
-# Add value labels
-for i, (bar, val) in enumerate(zip(bars2, stats_df['high_shade_pct'])):
-    ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1, 
-             f'{val:.1f}%', ha='center', va='bottom', fontsize=9, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig(output_dir / 'temporal_comparison.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: temporal_comparison.png")
-plt.close()
+def make_viz3():
+    print("\n3. Creating temporal comparison chart...")
+
+    edges = load_edges(scenario_cols)
+
+    # Calculate statistics
+    stats_df = scenario_stats(edges)
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle('Temporal Variation in Shade Availability', fontsize=16, fontweight='bold')
+
+    # Mean shade by scenario
+    bars1 = ax1.bar(range(len(stats_df)), stats_df['mean'],
+                    color=['#d32f2f', '#f57c00', '#fbc02d', '#689f38',
+                           '#388e3c', '#1976d2', '#7b1fa2', '#c2185b'])
+    ax1.set_xticks(range(len(stats_df)))
+    ax1.set_xticklabels(stats_df['scenario'], rotation=45, ha='right', fontsize=9)
+    ax1.set_ylabel('Mean Shade Coverage', fontsize=12)
+    ax1.set_title('Average Shade Coverage by Scenario', fontsize=12, fontweight='bold')
+    ax1.grid(axis='y', alpha=0.3)
+    ax1.set_ylim(0, 1)
+
+    # Add value labels
+    ax1.bar_label(bars1, labels=[f'{v:.1%}' for v in stats_df['mean']],
+                  fontsize=9, fontweight='bold', padding=3)
+
+    # High-shade percentage
+    bars2 = ax2.bar(range(len(stats_df)), stats_df['high_shade_pct'],
+                    color=['#d32f2f', '#f57c00', '#fbc02d', '#689f38',
+                           '#388e3c', '#1976d2', '#7b1fa2', '#c2185b'])
+    ax2.set_xticks(range(len(stats_df)))
+    ax2.set_xticklabels(stats_df['scenario'], rotation=45, ha='right', fontsize=9)
+    ax2.set_ylabel('Percentage of Segments', fontsize=12)
+    ax2.set_title('Segments with >50% Shade', fontsize=12, fontweight='bold')
+    ax2.grid(axis='y', alpha=0.3)
+
+    # Add value labels
+    ax2.bar_label(bars2, fmt='%.1f%%', fontsize=9, fontweight='bold', padding=3)
+
+    plt.tight_layout()
+    plt.savefig(output_dir / 'temporal_comparison.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: temporal_comparison.png")
+    plt.close()
+
 
 # ============================================================================
 # VISUALIZATION 4: Building vs Tree Contribution
 # ============================================================================
 
-print("\n4. Creating building vs tree contribution chart...")
-
-# Calculate contributions
-contributions = []
-for scenario_name in ['summer_morning', 'summer_midday', 'summer_evening',
-                      'winter_morning', 'winter_midday', 'winter_evening',
-                      'spring_midday', 'fall_midday']:
-    building_col = f'building_shadow_{scenario_name}'
-    tree_col = f'tree_shadow_{scenario_name}'
-    
-    if building_col in edges.columns and tree_col in edges.columns:
-        contributions.append({
-            'scenario': scenario_name.replace('_', ' ').title(),
-            'building': edges[building_col].mean(),
-            'tree': edges[tree_col].mean()
-        })
-
-contrib_df = pd.DataFrame(contributions)
-
-fig, ax = plt.subplots(figsize=(14, 7))
-
-x = np.arange(len(contrib_df))
-width = 0.35
-
-bars1 = ax.bar(x - width/2, contrib_df['building'], width, 
-               label='Building Shade', color='#1976d2', alpha=0.8)
-bars2 = ax.bar(x + width/2, contrib_df['tree'], width,
-               label='Tree Shade', color='#388e3c', alpha=0.8)
-
-ax.set_xlabel('Scenario', fontsize=12, fontweight='bold')
-ax.set_ylabel('Mean Shade Coverage', fontsize=12, fontweight='bold')
-ax.set_title('Building vs Tree Shade Contribution by Scenario', fontsize=14, fontweight='bold')
-ax.set_xticks(x)
-ax.set_xticklabels(contrib_df['scenario'], rotation=45, ha='right')
-ax.legend(fontsize=11)
-ax.grid(axis='y', alpha=0.3)
-
-# Add value labels
-for bars in [bars1, bars2]:
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.1%}', ha='center', va='bottom', fontsize=8)
-
-plt.tight_layout()
-plt.savefig(output_dir / 'building_vs_tree_contribution.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: building_vs_tree_contribution.png")
-plt.close()
+def make_viz4():
+    print("\n4. Creating building vs tree contribution chart...")
+
+    edges = load_edges(shadow_cols)
+
+    # Calculate contributions
+    contrib_df = shade_contributions(edges)
+
+    fig, ax = plt.subplots(figsize=(14, 7))
+
+    x = np.arange(len(contrib_df))
+    width = 0.35
+
+    bars1 = ax.bar(x - width/2, contrib_df['building'], width,
+                   label='Building Shade', color='#1976d2', alpha=0.8)
+    bars2 = ax.bar(x + width/2, contrib_df['tree'], width,
+                   label='Tree Shade', color='#388e3c', alpha=0.8)
+
+    ax.set_xlabel('Scenario', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Mean Shade Coverage', fontsize=12, fontweight='bold')
+    ax.set_title('Building vs Tree Shade Contribution by Scenario', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(contrib_df['scenario'], rotation=45, ha='right')
+    ax.legend(fontsize=11)
+    ax.grid(axis='y', alpha=0.3)
+
+    # Add value labels
+    for bars in [bars1, bars2]:
+        ax.bar_label(bars, labels=[f'{b.get_height():.1%}' for b in bars], fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig(output_dir / 'building_vs_tree_contribution.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: building_vs_tree_contribution.png")
+    plt.close()
+
 
 # ============================================================================
 # VISUALIZATION 5: Summer vs Winter Comparison Map
 # ============================================================================
 
-print("\n5. Creating summer vs winter comparison map...")
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-fig.suptitle('Summer Midday vs Winter Morning Shade Coverage', fontsize=16, fontweight='bold')
+def make_viz5():
+    print("\n5. Creating summer vs winter comparison map...")
+
+    edges = load_edges(['shade_summer_midday', 'shade_winter_morning'])
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+    fig.suptitle('Summer Midday vs Winter Morning Shade Coverage', fontsize=16, fontweight='bold')
+
+    shade_norm = Normalize(vmin=0, vmax=1)
+    panels = [
+        (ax1, 'shade_summer_midday', 'Summer Midday (12 PM)\nWorst Shade Conditions'),
+        (ax2, 'shade_winter_morning', 'Winter Morning (8 AM)\nBest Shade Conditions'),
+    ]
+    for ax, col, title in panels:
+        if col in edges.columns:
+            # Segments without a value are not drawn, as with GeoDataFrame.plot(column=...)
+            shaded = edges[edges[col].notna()]
+            plot_edges(ax, shaded, plt.cm.RdYlGn(shade_norm(shaded[col].to_numpy())), linewidths=0.5)
+            fig.colorbar(ScalarMappable(norm=shade_norm, cmap='RdYlGn'), ax=ax,
+                         label='Shade Coverage', shrink=0.8)
+            ax.set_title(title, fontsize=12, fontweight='bold')
+            ax.axis('off')
+            if HAVE_BASEMAP:
+                add_basemap(ax, edges.total_bounds, alpha=0.3)
 
-# Summer midday
-if 'shade_summer_midday' in edges.columns:
-    edges.plot(column='shade_summer_midday', ax=ax1, legend=True, cmap='RdYlGn',
-               vmin=0, vmax=1, linewidth=0.5,
-               legend_kwds={'label': 'Shade Coverage', 'shrink': 0.8})
-    ax1.set_title('Summer Midday (12 PM)\nWorst Shade Conditions', fontsize=12, fontweight='bold')
-    ax1.axis('off')
-    try:
-        cx.add_basemap(ax1, crs=edges.crs, source=cx.providers.CartoDB.Positron, alpha=0.3)
-    except:
-        pass
-
-# Winter morning
-if 'shade_winter_morning' in edges.columns:
-    edges.plot(column='shade_winter_morning', ax=ax2, legend=True, cmap='RdYlGn',
-               vmin=0, vmax=1, linewidth=0.5,
-               legend_kwds={'label': 'Shade Coverage', 'shrink': 0.8})
-    ax2.set_title('Winter Morning (8 AM)\nBest Shade Conditions', fontsize=12, fontweight='bold')
-    ax2.axis('off')
-    try:
-        cx.add_basemap(ax2, crs=edges.crs, source=cx.providers.CartoDB.Positron, alpha=0.3)
-    except:
-        pass
+    plt.tight_layout()
+    plt.savefig(output_dir / 'summer_vs_winter_comparison.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: summer_vs_winter_comparison.png")
+    plt.close()
 
-plt.tight_layout()
-plt.savefig(output_dir / 'summer_vs_winter_comparison.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: summer_vs_winter_comparison.png")
-plt.close()
 
 # ============================================================================
 # VISUALIZATION 6: High Shade vs Low Shade Corridors Map
 # ============================================================================
 
-print("\n6. Creating shade corridors map...")
-
-if 'shade_summer_midday' in edges.columns:
-    # Classify segments
-    edges['shade_class'] = pd.cut(edges['shade_summer_midday'], 
-                                   bins=[0, 0.2, 0.4, 0.6, 0.8, 1.0],
-                                   labels=['Very Low (0-20%)', 'Low (20-40%)', 
-                                           'Moderate (40-60%)', 'High (60-80%)', 
-                                           'Very High (80-100%)'])
-    
-    fig, ax = plt.subplots(figsize=(14, 10))
-    
-    colors = ['#d32f2f', '#f57c00', '#fbc02d', '#689f38', '#388e3c']
-    
-    edges.plot(column='shade_class', ax=ax, legend=True, 
-               categorical=True, cmap='RdYlGn', linewidth=1,
-               legend_kwds={'title': 'Shade Category', 'loc': 'upper left'})
-    
-    ax.set_title('Shade Corridors - Summer Midday\nIdentifying Shade Deserts and Shaded Routes',
-                 fontsize=14, fontweight='bold', pad=20)
-    ax.axis('off')
-    
-    try:
-        cx.add_basemap(ax, crs=edges.crs, source=cx.providers.CartoDB.Positron, alpha=0.3)
-    except:
-        pass
-    
-    plt.tight_layout()
-    plt.savefig(output_dir / 'shade_corridors_map.png', dpi=300, bbox_inches='tight')
-    print(f"  ✓ Saved: shade_corridors_map.png")
-    plt.close()
+def make_viz6():
+    print("\n6. Creating shade corridors map...")
+
+    edges = load_edges(['shade_summer_midday'])
+    # Full-network bounds, matching the basemap mosaic warmed by the main process
+    bounds = edges.total_bounds
+
+    if 'shade_summer_midday' in edges.columns:
+        # Segments without a shade value are not drawn (as with pd.cut -> NaN)
+        edges = edges[edges['shade_summer_midday'].notna()].copy()
+
+        # Classify segments (integer class index 0-4), right-inclusive like pd.cut
+        edges['shade_class'] = np.digitize(edges['shade_summer_midday'].to_numpy(),
+                                           [0.2, 0.4, 0.6, 0.8], right=True).astype(np.int8)
+        class_labels = ['Very Low (0-20%)', 'Low (20-40%)', 'Moderate (40-60%)',
+                        'High (60-80%)', 'Very High (80-100%)']
+
+        fig, ax = plt.subplots(figsize=(14, 10))
+
+        colors = ['#d32f2f', '#f57c00', '#fbc02d', '#689f38', '#388e3c']
+        class_cmap = ListedColormap(colors)
+
+        # Fixed class -> color lookup so missing classes don't shift the colors
+        plot_edges(ax, edges, class_cmap(edges['shade_class'].to_numpy()), linewidths=1)
+        ax.legend(handles=[mpatches.Patch(color=c, label=l) for c, l in zip(colors, class_labels)],
+                  title='Shade Category', loc='upper left')
+
+        ax.set_title('Shade Corridors - Summer Midday\nIdentifying Shade Deserts and Shaded Routes',
+                     fontsize=14, fontweight='bold', pad=20)
+        ax.axis('off')
+
+        if HAVE_BASEMAP:
+            add_basemap(ax, bounds, alpha=0.3)
+
+        plt.tight_layout()
+        plt.savefig(output_dir / 'shade_corridors_map.png', **SAVE_KWARGS)
+        print(f"  ✓ Saved: shade_corridors_map.png")
+        plt.close()
+
 
 # ============================================================================
 # VISUALIZATION 7: Box Plot Comparison
 # ============================================================================
 
-print("\n7. Creating box plot comparison...")
+def make_viz7():
+    print("\n7. Creating box plot comparison...")
+
+    edges = load_edges(scenario_cols)
 
-# Prepare data for box plots
-box_data = []
-for col, title in scenarios:
-    if col in edges.columns:
-        values = edges[col].dropna()
-        for val in values:
-            box_data.append({'Scenario': title, 'Shade': val})
+    # Wide-form input: one column per scenario, no long-form melt or copy
+    cols, labels = zip(*[(c, t) for c, t in scenarios if c in edges.columns])
 
-box_df = pd.DataFrame(box_data)
+    fig, ax = plt.subplots(figsize=(14, 7))
 
-fig, ax = plt.subplots(figsize=(14, 7))
+    sns.boxplot(data=edges.loc[:, list(cols)].set_axis(list(labels), axis=1),
+                ax=ax, palette='Set2')
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.set_ylabel('Shade Coverage', fontsize=12, fontweight='bold')
+    ax.set_xlabel('Scenario', fontsize=12, fontweight='bold')
+    ax.set_title('Shade Distribution by Scenario - Box Plot Comparison', fontsize=14, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3)
 
-sns.boxplot(data=box_df, x='Scenario', y='Shade', ax=ax, palette='Set2')
-ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
-ax.set_ylabel('Shade Coverage', fontsize=12, fontweight='bold')
-ax.set_xlabel('Scenario', fontsize=12, fontweight='bold')
-ax.set_title('Shade Distribution by Scenario - Box Plot Comparison', fontsize=14, fontweight='bold')
-ax.grid(axis='y', alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(output_dir / 'shade_boxplot_comparison.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: shade_boxplot_comparison.png")
+    plt.close()
 
-plt.tight_layout()
-plt.savefig(output_dir / 'shade_boxplot_comparison.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: shade_boxplot_comparison.png")
-plt.close()
 
 # ============================================================================
 # VISUALIZATION 8: Summary Dashboard
 # ============================================================================
 
-print("\n8. Creating summary dashboard...")
-
-fig = plt.figure(figsize=(18, 12))
-gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
-
-# Title
-fig.suptitle('University City Shade Analysis - Complete Dashboard', 
-             fontsize=18, fontweight='bold', y=0.98)
-
-# 1. Mean shade by scenario (bar chart)
-ax1 = fig.add_subplot(gs[0, :2])
-bars = ax1.bar(range(len(stats_df)), stats_df['mean'], 
-               color=plt.cm.RdYlGn(stats_df['mean']))
-ax1.set_xticks(range(len(stats_df)))
-ax1.set_xticklabels([s.split('\n')[0] for s in stats_df['scenario']], 
-                     rotation=45, ha='right', fontsize=9)
-ax1.set_ylabel('Mean Shade Coverage', fontsize=10, fontweight='bold')
-ax1.set_title('Average Shade by Scenario', fontsize=11, fontweight='bold')
-ax1.grid(axis='y', alpha=0.3)
-for bar, val in zip(bars, stats_df['mean']):
-    ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.02,
-             f'{val:.1%}', ha='center', fontsize=8)
-
-# 2. Key statistics
-ax2 = fig.add_subplot(gs[0, 2])
-ax2.axis('off')
-stats_text = f"""
+def make_viz8():
+    print("\n8. Creating summary dashboard...")
+
+    edges = load_edges(scenario_cols + shadow_cols + ['length'])
+    stats_df = scenario_stats(edges)
+    contrib_df = shade_contributions(edges)
+    n_segments = len(edges)
+    network_miles = total_miles(edges)
+
+    # Constrained layout spaces the grid (and suptitle) in a single solve
+    fig = plt.figure(figsize=(18, 12), layout='constrained')
+    gs = fig.add_gridspec(3, 3)
+
+    # Title
+    fig.suptitle('University City Shade Analysis - Complete Dashboard',
+                 fontsize=18, fontweight='bold')
+
+    # 1. Mean shade by scenario (bar chart)
+    ax1 = fig.add_subplot(gs[0, :2])
+    bars = ax1.bar(range(len(stats_df)), stats_df['mean'],
+                   color=plt.cm.RdYlGn(stats_df['mean']))
+    ax1.set_xticks(range(len(stats_df)))
+    ax1.set_xticklabels([s.split('\n')[0] for s in stats_df['scenario']],
+                         rotation=45, ha='right', fontsize=9)
+    ax1.set_ylabel('Mean Shade Coverage', fontsize=10, fontweight='bold')
+    ax1.set_title('Average Shade by Scenario', fontsize=11, fontweight='bold')
+    ax1.grid(axis='y', alpha=0.3)
+    ax1.bar_label(bars, labels=[f'{v:.1%}' for v in stats_df['mean']], fontsize=8, padding=3)
+
+    # 2. Key statistics
+    ax2 = fig.add_subplot(gs[0, 2])
+    ax2.axis('off')
+    means = stats_df['mean'].to_numpy()
+    best, worst = int(means.argmax()), int(means.argmin())
+    best_name = stats_df['scenario'].iat[best].split('\n')[0]
+    worst_name = stats_df['scenario'].iat[worst].split('\n')[0]
+    stats_text = f"""
 KEY STATISTICS
 
 Network Size:
-• {len(edges):,} segments
-• {edges.geometry.length.sum()/5280:.1f} miles
+• {n_segments:,} segments
+• {network_miles:.1f} miles
 
 Best Scenario:
-• {stats_df.iloc[stats_df['mean'].idxmax()]['scenario'].split(chr(10))[0]}
-• {stats_df['mean'].max():.1%} mean shade
+• {best_name}
+• {means[best]:.1%} mean shade
 
 Worst Scenario:
-• {stats_df.iloc[stats_df['mean'].idxmin()]['scenario'].split(chr(10))[0]}
-• {stats_df['mean'].min():.1%} mean shade
+• {worst_name}
+• {means[worst]:.1%} mean shade
 
 Variation:
-• {stats_df['mean'].max() - stats_df['mean'].min():.1%} range
-• {stats_df['mean'].std():.1%} std dev
+• {means[best] - means[worst]:.1%} range
+• {means.std(ddof=1):.1%} std dev
 """
-ax2.text(0.1, 0.5, stats_text, fontsize=10, verticalalignment='center',
-         family='monospace', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
+    ax2.text(0.1, 0.5, stats_text, fontsize=10, verticalalignment='center',
+             family='monospace', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
+
+    # 3. Building vs Tree contribution
+    ax3 = fig.add_subplot(gs[1, :])
+    if len(contrib_df) > 0:
+        x = np.arange(len(contrib_df))
+        width = 0.35
+        ax3.bar(x - width/2, contrib_df['building'], width, label='Buildings',
+                color='#1976d2', alpha=0.8)
+        ax3.bar(x + width/2, contrib_df['tree'], width, label='Trees',
+                color='#388e3c', alpha=0.8)
+        ax3.set_xticks(x)
+        ax3.set_xticklabels([s.split()[0] for s in contrib_df['scenario']],
+                             rotation=45, ha='right')
+        ax3.set_ylabel('Mean Shade Coverage', fontsize=10, fontweight='bold')
+        ax3.set_title('Shade Source Contribution', fontsize=11, fontweight='bold')
+        ax3.legend()
+        ax3.grid(axis='y', alpha=0.3)
+
+    # 4. Shade distribution histogram (summer midday)
+    ax4 = fig.add_subplot(gs[2, 0])
+    if 'shade_summer_midday' in edges.columns:
+        data = edges['shade_summer_midday'].to_numpy(dtype=np.float32, copy=False)
+        data = data[~np.isnan(data)]
+        ax4.hist(data, bins=30, color='coral', edgecolor='black', alpha=0.7)
+        ax4.axvline(data.mean(), color='red', linestyle='--', linewidth=2)
+        ax4.set_xlabel('Shade Coverage', fontsize=9)
+        ax4.set_ylabel('Frequency', fontsize=9)
+        ax4.set_title('Summer Midday Distribution', fontsize=10, fontweight='bold')
+
+    # 5. Shade distribution histogram (winter morning)
+    ax5 = fig.add_subplot(gs[2, 1])
+    if 'shade_winter_morning' in edges.columns:
+        data = edges['shade_winter_morning'].to_numpy(dtype=np.float32, copy=False)
+        data = data[~np.isnan(data)]
+        ax5.hist(data, bins=30, color='lightgreen', edgecolor='black', alpha=0.7)
+        ax5.axvline(data.mean(), color='green', linestyle='--', linewidth=2)
+        ax5.set_xlabel('Shade Coverage', fontsize=9)
+        ax5.set_ylabel('Frequency', fontsize=9)
+        ax5.set_title('Winter Morning Distribution', fontsize=10, fontweight='bold')
+
+    # 6. High shade percentage
+    ax6 = fig.add_subplot(gs[2, 2])
+    bars = ax6.barh(range(len(stats_df)), stats_df['high_shade_pct'],
+                    color=plt.cm.RdYlGn(stats_df['mean']))
+    ax6.set_yticks(range(len(stats_df)))
+    ax6.set_yticklabels([s.split('\n')[0] for s in stats_df['scenario']], fontsize=8)
+    ax6.set_xlabel('% Segments >50% Shade', fontsize=9, fontweight='bold')
+    ax6.set_title('High-Shade Segments', fontsize=10, fontweight='bold')
+    ax6.grid(axis='x', alpha=0.3)
+
+    plt.savefig(output_dir / 'dashboard_summary.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: dashboard_summary.png")
+    plt.close()
 
-# 3. Building vs Tree contribution
-ax3 = fig.add_subplot(gs[1, :])
-if len(contrib_df) > 0:
-    x = np.arange(len(contrib_df))
-    width = 0.35
-    ax3.bar(x - width/2, contrib_df['building'], width, label='Buildings', 
-            color='#1976d2', alpha=0.8)
-    ax3.bar(x + width/2, contrib_df['tree'], width, label='Trees',
-            color='#388e3c', alpha=0.8)
-    ax3.set_xticks(x)
-    ax3.set_xticklabels([s.split()[0] for s in contrib_df['scenario']], 
-                         rotation=45, ha='right')
-    ax3.set_ylabel('Mean Shade Coverage', fontsize=10, fontweight='bold')
-    ax3.set_title('Shade Source Contribution', fontsize=11, fontweight='bold')
-    ax3.legend()
-    ax3.grid(axis='y', alpha=0.3)
-
-# 4. Shade distribution histogram (summer midday)
-ax4 = fig.add_subplot(gs[2, 0])
-if 'shade_summer_midday' in edges.columns:
-    data = edges['shade_summer_midday'].dropna()
-    ax4.hist(data, bins=30, color='coral', edgecolor='black', alpha=0.7)
-    ax4.axvline(data.mean(), color='red', linestyle='--', linewidth=2)
-    ax4.set_xlabel('Shade Coverage', fontsize=9)
-    ax4.set_ylabel('Frequency', fontsize=9)
-    ax4.set_title('Summer Midday Distribution', fontsize=10, fontweight='bold')
-
-# 5. Shade distribution histogram (winter morning)
-ax5 = fig.add_subplot(gs[2, 1])
-if 'shade_winter_morning' in edges.columns:
-    data = edges['shade_winter_morning'].dropna()
-    ax5.hist(data, bins=30, color='lightgreen', edgecolor='black', alpha=0.7)
-    ax5.axvline(data.mean(), color='green', linestyle='--', linewidth=2)
-    ax5.set_xlabel('Shade Coverage', fontsize=9)
-    ax5.set_ylabel('Frequency', fontsize=9)
-    ax5.set_title('Winter Morning Distribution', fontsize=10, fontweight='bold')
-
-# 6. High shade percentage
-ax6 = fig.add_subplot(gs[2, 2])
-bars = ax6.barh(range(len(stats_df)), stats_df['high_shade_pct'],
-                color=plt.cm.RdYlGn(stats_df['mean']))
-ax6.set_yticks(range(len(stats_df)))
-ax6.set_yticklabels([s.split('\n')[0] for s in stats_df['scenario']], fontsize=8)
-ax6.set_xlabel('% Segments >50% Shade', fontsize=9, fontweight='bold')
-ax6.set_title('High-Shade Segments', fontsize=10, fontweight='bold')
-ax6.grid(axis='x', alpha=0.3)
-
-plt.savefig(output_dir / 'dashboard_summary.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: dashboard_summary.png")
-plt.close()
 
 # ============================================================================
 # VISUALIZATION 9: Study Area Overview Map
 # ============================================================================
 
-print("\n9. Creating study area overview map...")
+def make_viz9():
+    print("\n9. Creating study area overview map...")
 
-fig, ax = plt.subplots(figsize=(12, 12))
+    edges = load_edges(['length'])
+    network_miles = total_miles(edges)
 
-# Plot network
-edges.plot(ax=ax, color='gray', linewidth=0.5, alpha=0.5)
+    fig, ax = plt.subplots(figsize=(12, 12))
 
-# Add basemap
-try:
-    cx.add_basemap(ax, crs=edges.crs, source=cx.providers.CartoDB.Positron)
-except:
-    pass
+    # Plot network
+    plot_edges(ax, edges, 'gray', linewidths=0.5, alpha=0.5)
 
-ax.set_title('Study Area: University City, Philadelphia\nPedestrian Network Coverage',
-             fontsize=14, fontweight='bold', pad=20)
-ax.axis('off')
+    # Add basemap
+    if HAVE_BASEMAP:
+        add_basemap(ax, edges.total_bounds)
 
-# Add scale bar and north arrow (simple text)
-ax.text(0.05, 0.05, f'{len(edges):,} segments\n{edges.geometry.length.sum()/5280:.1f} miles',
-        transform=ax.transAxes, fontsize=11, verticalalignment='bottom',
-        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+    ax.set_title('Study Area: University City, Philadelphia\nPedestrian Network Coverage',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.axis('off')
 
-plt.tight_layout()
-plt.savefig(output_dir / 'study_area_overview.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: study_area_overview.png")
-plt.close()
+    # Add scale bar and north arrow (simple text)
+    ax.text(0.05, 0.05, f'{len(edges):,} segments\n{network_miles:.1f} miles',
+            transform=ax.transAxes, fontsize=11, verticalalignment='bottom',
+            bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
-# ============================================================================
-# SUMMARY
-# ============================================================================
+    plt.tight_layout()
+    plt.savefig(output_dir / 'study_area_overview.png', **SAVE_KWARGS)
+    print(f"  ✓ Saved: study_area_overview.png")
+    plt.close()
+
+
+VISUALIZATIONS = [make_viz1, make_viz2, make_viz3, make_viz4, make_viz5,
+                  make_viz6, make_viz7, make_viz8, make_viz9]
+
+
+def run_all(max_workers=4):
+    """Render every figure; max_workers=1 runs serially in this process."""
+    # Before any worker starts, so they never race to write the file
+    ensure_edges_parquet()
+
+    # Stitch the basemap tiles once up front; workers load the persisted mosaic
+    if HAVE_BASEMAP:
+        basemap_tiles(tuple(float(b) for b in load_edges().total_bounds))
+
+    if max_workers == 1:
+        for viz in VISUALIZATIONS:
+            viz()
+        return
+
+    # The figures are independent, so render them in parallel worker processes.
+    # Each worker reads the Parquet file itself instead of receiving a pickled
+    # GeoDataFrame.
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(viz) for viz in VISUALIZATIONS]
+        for future in futures:
+            future.result()
+
+
+if __name__ == '__main__':
+    print("🎨 Generating comprehensive visualizations...")
+
+    run_all()
+
+    # ============================================================================
+    # SUMMARY
+    # ============================================================================
 
-print("\n" + "="*70)
-print("✅ VISUALIZATION GENERATION COMPLETE!")
-print("="*70)
+    print("\n" + "="*70)
+    print("✅ VISUALIZATION GENERATION COMPLETE!")
+    print("="*70)
 
-print(f"\nGenerated {len(list(output_dir.glob('*.png')))} visualization files in: {output_dir}")
-print("\nFiles created:")
-for f in sorted(output_dir.glob('*.png')):
-    print(f"  ✓ {f.name}")
+    print(f"\nGenerated {len(list(output_dir.glob('*.png')))} visualization files in: {output_dir}")
+    print("\nFiles created:")
+    for f in sorted(output_dir.glob('*.png')):
+        print(f"  ✓ {f.name}")
 
-print("\n📋 Next steps:")
-print("1. Copy all PNG files to your website's figures/ folder")
-print("2. Images are referenced in the updated website pages")
-print("3. Render website with 'quarto render'")
-print("\n🎨 Your website will be super visual!")
+    print("\n📋 Next steps:")
+    print("1. Copy all PNG files to your website's figures/ folder")
+    print("2. Images are referenced in the updated website pages")
+    print("3. Render website with 'quarto render'")
+    print("\n🎨 Your website will be super visual!")
@@ -8,18 +8,21 @@ Author: Kavana Raju
 Course: MUSA 5500 - Geospatial Data Science with Python
 """
 
+import os
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
+import numba
 import geopandas as gpd
+import shapely
 from shapely.geometry import Point, LineString
-import osmnx as ox
-import networkx as nx
+from shapely.prepared import prep
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from sklearn.neighbors import BallTree
 import folium
-from folium import plugins
 from streamlit_folium import st_folium
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import json
 
@@ -65,13 +68,73 @@ st.markdown("""
 st.markdown('<h1 class="main-header">🌳 Shade-Optimized Pedestrian Routing Tool</h1>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">Find the shadiest walking routes to transit in University City, Philadelphia</p>', unsafe_allow_html=True)
 
+# Shade overlay colors, red (low shade) to green (high shade), indexed by int(shade*255)
+SHADE_PALETTE = [f'#{int(255*(1-v/255)):02x}{int(255*v/255):02x}00' for v in range(256)]
+
+# Routing arrays are written offline from the GraphML (Notebook 5, step 7b)
+GRAPH_PATH = 'data/processed/university_city_network_with_shade.graphml'
+NODES_PATH = 'data/processed/routing_nodes.npz'
+EDGES_PATH = 'data/processed/routing_edges.parquet'
+
+def graph_arrays_stale():
+    """True if the GraphML is present and newer than the routing arrays built from it."""
+    if not os.path.exists(GRAPH_PATH):
+        return False
+    graph_mtime = os.path.getmtime(GRAPH_PATH)
+    return any(os.path.getmtime(path) < graph_mtime for path in (NODES_PATH, EDGES_PATH))
+
+def build_network(nodes, edges):
+    """Routing structures: node ids, BallTree, CSR weight matrices and per-slot edge attrs."""
+    node_ids = nodes['id']
+    n = len(node_ids)
+    positions = pd.Index(node_ids)
+    edges = edges.assign(r=positions.get_indexer(edges['u']),
+                         c=positions.get_indexer(edges['v']))
+    
+    # Dijkstra weights: min over parallel edges, as networkx does for multigraphs.
+    # groupby sorts (r, c), which is also the CSR slot order.
+    pair_min = edges.groupby(['r', 'c'])[['length', 'shade_weight']].min()
+    rows = pair_min.index.get_level_values('r')
+    cols = pair_min.index.get_level_values('c')
+    
+    def to_csr(weight):
+        # float64: csgraph.dijkstra validates to float64 and would copy anything else per call
+        data = pair_min[weight].to_numpy(dtype=np.float64)
+        return csr_matrix((data, (rows, cols)), shape=(n, n))
+    
+    # Route metrics use key 0 of each (u, v) pair, matching graph[u][v][0]
+    first = edges[edges['key'] == 0].set_index(['r', 'c']).reindex(pair_min.index)
+    
+    return {
+        'node_ids': node_ids,
+        'node_index': {node: i for i, node in enumerate(node_ids)},
+        'node_lat': nodes['y'],
+        'node_lon': nodes['x'],
+        'n_edges': len(edges),
+        'tree': BallTree(np.deg2rad(np.column_stack([nodes['y'], nodes['x']])),
+                         metric='haversine'),
+        'csr_length': to_csr('length'),
+        'csr_shade': to_csr('shade_weight'),
+        'edge_len': first['length'].to_numpy(),
+        'edge_shade': first['shade_score'].to_numpy(),
+    }
+
 # Cache data loading
 @st.cache_resource
 def load_data():
     """Load all necessary data files."""
     try:
-        # Load network
-        G = ox.load_graphml('data/processed/university_city_network_with_shade.graphml')
+        # Load network from the routing arrays
+        if not (os.path.exists(NODES_PATH) and os.path.exists(EDGES_PATH)):
+            raise FileNotFoundError(
+                f"{NODES_PATH} / {EDGES_PATH} not found - run Notebook 5 step 7b to export them"
+            )
+        if graph_arrays_stale():
+            st.warning("⚠️ Routing arrays are older than the GraphML network. "
+                       "Re-run Notebook 5 step 7b to refresh them.")
+        with np.load(NODES_PATH) as npz:
+            nodes = {key: npz[key] for key in ('id', 'x', 'y')}
+        network = build_network(nodes, pd.read_parquet(EDGES_PATH))
         
         # Load GeoDataFrames
         septa_gdf = gpd.read_file('data/processed/septa_stops.geojson')
@@ -81,14 +144,26 @@ def load_data():
         # Get major stations for dropdown
         major_stations = septa_gdf[septa_gdf['category'] == 'Major Transit'].copy()
         
-        return G, septa_gdf, edges_gdf, study_area, major_stations
+        # Prepared study-area polygon for fast origin validation
+        study_prep = prep(study_area.union_all())
+        
+        # Background overlay: GeoJSON (lon, lat) coords and shade score per edge.
+        # One vectorized coordinate dump, split into per-edge array views.
+        xy, part = shapely.get_coordinates(edges_gdf.geometry.values, return_index=True)
+        offsets = np.cumsum(np.bincount(part, minlength=len(edges_gdf)))[:-1]
+        edge_overlay = {
+            'coords': np.split(xy, offsets),
+            'shade': edges_gdf['shade_score'].to_numpy(),
+        }
+        
+        return septa_gdf, edge_overlay, study_area, study_prep, major_stations, network
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         st.stop()
 
 # Load data
 with st.spinner("Loading network data..."):
-    G, septa_gdf, edges_gdf, study_area, major_stations = load_data()
+    septa_gdf, edge_overlay, study_area, study_prep, major_stations, network = load_data()
 
 # Study area bounds
 bounds = study_area.total_bounds  # [minx, miny, maxx, maxy]
@@ -173,124 +248,235 @@ with st.sidebar.expander("📊 About This Tool"):
     """)
 
 # Main content area
-def calculate_route_from_coords(lat, lon, destination_stop_name, graph, septa_df):
-    """Calculate walking route from coordinates to transit stop."""
-    try:
-        # Find nearest network node to origin
-        origin_node = ox.nearest_nodes(graph, lon, lat)
-        
-        # Find destination stop
-        dest_stops = septa_df[septa_df['name'] == destination_stop_name]
-        if len(dest_stops) == 0:
-            return None
-        
-        dest_stop = dest_stops.iloc[0]
-        dest_node = ox.nearest_nodes(graph, dest_stop.geometry.x, dest_stop.geometry.y)
-        
-        results = {
-            'origin_lat': lat,
-            'origin_lon': lon,
-            'dest_name': dest_stop['name'],
-            'dest_lat': dest_stop.geometry.y,
-            'dest_lon': dest_stop.geometry.x,
-        }
-        
-        # Calculate shortest route
-        shortest_path = nx.shortest_path(graph, origin_node, dest_node, weight='length')
-        shortest_length = 0
-        shortest_shade_weighted = 0
-        
-        for i in range(len(shortest_path) - 1):
-            u, v = shortest_path[i], shortest_path[i+1]
-            edge_data = graph[u][v][0]
-            edge_length = edge_data['length']
-            shortest_length += edge_length
-            shortest_shade_weighted += edge_data.get('shade_score', 0) * edge_length
-        
-        shortest_avg_shade = shortest_shade_weighted / shortest_length if shortest_length > 0 else 0
-        
-        results['shortest_path'] = shortest_path
-        results['shortest_length_ft'] = shortest_length
-        results['shortest_length_m'] = shortest_length * 0.3048
-        results['shortest_shade_score'] = shortest_avg_shade
-        
-        # Calculate shadiest route
-        shadiest_path = nx.shortest_path(graph, origin_node, dest_node, weight='shade_weight')
-        shadiest_length = 0
-        shadiest_shade_weighted = 0
-        
-        for i in range(len(shadiest_path) - 1):
-            u, v = shadiest_path[i], shadiest_path[i+1]
-            edge_data = graph[u][v][0]
-            edge_length = edge_data['length']
-            shadiest_length += edge_length
-            shadiest_shade_weighted += edge_data.get('shade_score', 0) * edge_length
-        
-        shadiest_avg_shade = shadiest_shade_weighted / shadiest_length if shadiest_length > 0 else 0
-        
-        results['shadiest_path'] = shadiest_path
-        results['shadiest_length_ft'] = shadiest_length
-        results['shadiest_length_m'] = shadiest_length * 0.3048
-        results['shadiest_shade_score'] = shadiest_avg_shade
-        
-        # Calculate comparison metrics
-        results['length_increase_ft'] = shadiest_length - shortest_length
-        results['length_increase_m'] = results['length_increase_ft'] * 0.3048
-        results['length_increase_pct'] = (results['length_increase_ft'] / shortest_length * 100) if shortest_length > 0 else 0
-        results['shade_improvement'] = shadiest_avg_shade - shortest_avg_shade
-        results['shade_improvement_pct'] = (results['shade_improvement'] / shortest_avg_shade * 100) if shortest_avg_shade > 0 else 0
-        
-        if results['length_increase_m'] > 0:
-            results['shade_per_meter_detour'] = results['shade_improvement'] / results['length_increase_m']
-        else:
-            results['shade_per_meter_detour'] = float('inf')
-        
-        return results
-        
-    except nx.NetworkXNoPath:
+# cache=True: Streamlit re-executes this script on every rerun, creating a new
+# dispatcher each time; the on-disk cache lets it load the compiled kernel
+# instead of recompiling.
+@numba.njit(cache=True)
+def walk_and_reduce(predecessors, indptr, indices, edge_len, edge_shade, origin_idx, dest_idx):
+    """Rebuild the index path from Dijkstra predecessors, summing length and shade*length."""
+    n_steps = 0
+    v = dest_idx
+    while v != origin_idx:
+        v = predecessors[v]
+        n_steps += 1
+    
+    path = np.empty(n_steps + 1, dtype=np.int64)
+    path[n_steps] = dest_idx
+    total = 0.0
+    shade_weighted = 0.0
+    v = dest_idx
+    for k in range(n_steps - 1, -1, -1):
+        u = predecessors[v]
+        # Find the u -> v slot in the CSR row of u
+        for j in range(indptr[u], indptr[u + 1]):
+            if indices[j] == v:
+                total += edge_len[j]
+                shade_weighted += edge_len[j] * edge_shade[j]
+                break
+        path[k] = u
+        v = u
+    return path, total, shade_weighted
+
+def shortest_route(network, csr, origin_idx, dest_idx):
+    """Dijkstra on a CSR weight matrix; return (node path, length ft, mean shade) or None."""
+    dist, predecessors = dijkstra(csr, directed=True, indices=origin_idx,
+                                  return_predecessors=True)
+    if np.isinf(dist[dest_idx]):
         return None
-    except Exception as e:
-        st.error(f"Error calculating route: {str(e)}")
+    
+    lookup = network['csr_length']
+    path, total, shade_weighted = walk_and_reduce(
+        predecessors, lookup.indptr, lookup.indices,
+        network['edge_len'], network['edge_shade'], origin_idx, dest_idx
+    )
+    avg_shade = shade_weighted / total if total > 0 else 0
+    return list(network['node_ids'][path]), total, avg_shade
+
+def nearest_node(network, lat, lon):
+    """Snap a lat/lon to the nearest graph node using the cached BallTree."""
+    _, idx = network['tree'].query(np.deg2rad([[lat, lon]]), k=1)
+    return network['node_ids'][idx[0, 0]]
+
+def calculate_route_from_coords(lat, lon, destination_stop_name, septa_df, network):
+    """Calculate walking route from coordinates to transit stop.
+    
+    Returns None when no route exists; unexpected errors propagate so the
+    memoized wrapper never caches them.
+    """
+    # Find nearest network node to origin
+    origin_node = nearest_node(network, lat, lon)
+    
+    # Find destination stop
+    dest_stops = septa_df[septa_df['name'] == destination_stop_name]
+    if len(dest_stops) == 0:
+        return None
+    
+    dest_stop = dest_stops.iloc[0]
+    dest_node = nearest_node(network, dest_stop.geometry.y, dest_stop.geometry.x)
+    
+    origin_idx = network['node_index'][origin_node]
+    dest_idx = network['node_index'][dest_node]
+    
+    results = {
+        'origin_lat': lat,
+        'origin_lon': lon,
+        'dest_name': dest_stop['name'],
+        'dest_lat': dest_stop.geometry.y,
+        'dest_lon': dest_stop.geometry.x,
+    }
+    
+    # Calculate shortest route
+    shortest = shortest_route(network, network['csr_length'], origin_idx, dest_idx)
+    if shortest is None:
+        return None
+    shortest_path, shortest_length, shortest_avg_shade = shortest
+    
+    results['shortest_path'] = shortest_path
+    results['shortest_length_ft'] = shortest_length
+    results['shortest_length_m'] = shortest_length * 0.3048
+    results['shortest_shade_score'] = shortest_avg_shade
+    
+    # Calculate shadiest route
+    shadiest = shortest_route(network, network['csr_shade'], origin_idx, dest_idx)
+    if shadiest is None:
         return None
+    shadiest_path, shadiest_length, shadiest_avg_shade = shadiest
+    
+    results['shadiest_path'] = shadiest_path
+    results['shadiest_length_ft'] = shadiest_length
+    results['shadiest_length_m'] = shadiest_length * 0.3048
+    results['shadiest_shade_score'] = shadiest_avg_shade
+    
+    # Calculate comparison metrics
+    results['length_increase_ft'] = shadiest_length - shortest_length
+    results['length_increase_m'] = results['length_increase_ft'] * 0.3048
+    results['length_increase_pct'] = (results['length_increase_ft'] / shortest_length * 100) if shortest_length > 0 else 0
+    results['shade_improvement'] = shadiest_avg_shade - shortest_avg_shade
+    results['shade_improvement_pct'] = (results['shade_improvement'] / shortest_avg_shade * 100) if shortest_avg_shade > 0 else 0
+    
+    if results['length_increase_m'] > 0:
+        results['shade_per_meter_detour'] = results['shade_improvement'] / results['length_increase_m']
+    else:
+        results['shade_per_meter_detour'] = float('inf')
+    
+    return results
 
-def path_to_coords(path, graph):
+@st.cache_data(show_spinner=False)
+def _route_cached(lat_r: float, lon_r: float, dest_name: str):
+    """Memoized routing keyed on the rounded origin (~1 m) and destination."""
+    return calculate_route_from_coords(lat_r, lon_r, dest_name, septa_gdf, network)
+
+def path_to_coords(path, network):
     """Convert node path to coordinate list."""
-    coords = []
-    for node in path:
-        node_data = graph.nodes[node]
-        coords.append([node_data['y'], node_data['x']])  # [lat, lon] for folium
-    return coords
+    idx = [network['node_index'][node] for node in path]
+    # [lat, lon] for folium
+    return np.column_stack([network['node_lat'][idx], network['node_lon'][idx]]).tolist()
+
+@st.cache_data
+def build_background_edges_fc(_edge_overlay, max_edges=1000):
+    """Shade-colored FeatureCollection of every stride-th network edge."""
+    edge_coords = _edge_overlay['coords']
+    shade_arr = _edge_overlay['shade']
+    # Ceiling division keeps the layer within max_edges features
+    stride = max(1, -(-len(edge_coords) // max_edges))
+    
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'LineString', 'coordinates': edge_coords[i].tolist()},
+            'properties': {'c': SHADE_PALETTE[min(255, int(shade_arr[i]*255))]},
+        }
+        for i in range(0, len(edge_coords), stride)
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
 
-def create_route_map(route_results, graph, edges_gdf, septa_gdf):
+def add_station_layer(m, stations, tooltip=False):
+    """Add all stations as one GeoJson point layer with train markers."""
+    folium.GeoJson(
+        stations[['name', 'geometry']],
+        marker=folium.Marker(icon=folium.Icon(color='red', icon='train', prefix='fa')),
+        popup=folium.GeoJsonPopup(fields=['name'], labels=False),
+        tooltip=folium.GeoJsonTooltip(fields=['name'], labels=False) if tooltip else None
+    ).add_to(m)
+
+@st.cache_data
+def build_preview_map_html(center, _study_area, _major_stations):
+    """Render the static study-area preview map to HTML once."""
+    preview_map = folium.Map(
+        location=list(center),
+        zoom_start=13,
+        tiles='CartoDB positron',
+        prefer_canvas=True
+    )
+    
+    # Add study area
+    folium.GeoJson(
+        _study_area,
+        style_function=lambda x: {
+            'fillColor': 'lightblue',
+            'color': 'blue',
+            'weight': 3,
+            'fillOpacity': 0.2
+        }
+    ).add_to(preview_map)
+    
+    # Add major stations
+    add_station_layer(preview_map, _major_stations, tooltip=True)
+    
+    return preview_map.get_root().render()
+
+@st.cache_resource
+def build_click_map(center, _study_area, _major_stations):
+    """Build the origin-picking map once; st_folium only re-renders it."""
+    # Create base map
+    click_map = folium.Map(
+        location=list(center),
+        zoom_start=14,
+        tiles='CartoDB positron',
+        prefer_canvas=True
+    )
+    
+    # Add study area boundary
+    folium.GeoJson(
+        _study_area,
+        style_function=lambda x: {
+            'fillColor': 'transparent',
+            'color': 'blue',
+            'weight': 3,
+            'dashArray': '5, 5'
+        }
+    ).add_to(click_map)
+    
+    # Add major transit stations
+    add_station_layer(click_map, _major_stations)
+    
+    return click_map
+
+def create_route_map(route_results, network, edge_overlay, septa_gdf):
     """Create Folium map with both routes."""
     
     # Create base map
     m = folium.Map(
         location=[route_results['origin_lat'], route_results['origin_lon']],
         zoom_start=15,
-        tiles='CartoDB positron'
+        tiles='CartoDB positron',
+        prefer_canvas=True
     )
     
     # Add network edges colored by shade (background)
-    # Simplify for performance
-    edges_sample = edges_gdf.sample(min(1000, len(edges_gdf)))
-    
-    for idx, edge in edges_sample.iterrows():
-        shade_score = edge['shade_score']
-        # Color from red (low shade) to green (high shade)
-        color = f'#{int(255*(1-shade_score)):02x}{int(255*shade_score):02x}00'
-        
-        coords = [(point[1], point[0]) for point in edge.geometry.coords]
-        folium.PolyLine(
-            coords,
-            color=color,
-            weight=2,
-            opacity=0.3
-        ).add_to(m)
+    # Simplify for performance: ~1000 edges, built once per session
+    folium.GeoJson(
+        build_background_edges_fc(edge_overlay),
+        style_function=lambda f: {
+            'color': f['properties']['c'],
+            'weight': 2,
+            'opacity': 0.3
+        }
+    ).add_to(m)
     
     # Convert paths to coordinates
-    shortest_coords = path_to_coords(route_results['shortest_path'], graph)
-    shadiest_coords = path_to_coords(route_results['shadiest_path'], graph)
+    shortest_coords = path_to_coords(route_results['shortest_path'], network)
+    shadiest_coords = path_to_coords(route_results['shadiest_path'], network)
     
     # Add shortest route
     folium.PolyLine(
@@ -354,34 +540,11 @@ def create_route_map(route_results, graph, edges_gdf, septa_gdf):
 if input_method == "📍 Click on Map":
     st.markdown("### 📍 Click on the map to select your starting location")
     
-    # Create base map
-    click_map = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=14,
-        tiles='CartoDB positron'
-    )
-    
-    # Add study area boundary
-    folium.GeoJson(
-        study_area,
-        style_function=lambda x: {
-            'fillColor': 'transparent',
-            'color': 'blue',
-            'weight': 3,
-            'dashArray': '5, 5'
-        }
-    ).add_to(click_map)
-    
-    # Add major transit stations
-    for idx, station in major_stations.iterrows():
-        folium.Marker(
-            [station.geometry.y, station.geometry.x],
-            popup=station['name'],
-            icon=folium.Icon(color='red', icon='train', prefix='fa')
-        ).add_to(click_map)
+    click_map = build_click_map((center_lat, center_lon), study_area, major_stations)
     
     # Display map and get click
-    map_data = st_folium(click_map, width=700, height=500)
+    map_data = st_folium(click_map, width=700, height=500, key='click_map',
+                         returned_objects=['last_clicked'])
     
     # Get clicked coordinates
     if map_data and map_data.get('last_clicked'):
@@ -397,13 +560,18 @@ if calculate_button:
         st.error("⚠️ Please select a destination!")
     else:
         # Validate coordinates
-        if not (bounds[0] <= origin_lon <= bounds[2] and bounds[1] <= origin_lat <= bounds[3]):
+        if not study_prep.contains(Point(origin_lon, origin_lat)):
             st.warning("⚠️ Coordinates are outside the study area. Results may be inaccurate.")
         
         with st.spinner("Calculating routes... 🚶‍♀️"):
-            route_results = calculate_route_from_coords(
-                origin_lat, origin_lon, destination_name, G, septa_gdf
-            )
+            try:
+                route_results = _route_cached(
+                    round(origin_lat, 5), round(origin_lon, 5), destination_name
+                )
+            except Exception as e:
+                # Raised inside the cached function, so the failure is not memoized
+                st.error(f"Error calculating route: {str(e)}")
+                route_results = None
         
         if route_results is None:
             st.error("❌ Could not calculate route. Please try a different location or destination.")
@@ -504,7 +672,7 @@ if calculate_button:
             # Display map
             st.markdown("### 🗺️ Route Visualization")
             
-            route_map = create_route_map(route_results, G, edges_gdf, septa_gdf)
+            route_map = create_route_map(route_results, network, edge_overlay, septa_gdf)
             st_folium(route_map, width=1000, height=600)
             
             # Recommendation
@@ -572,33 +740,8 @@ else:
     # Show study area map
     st.markdown("### 📍 Study Area: University City")
     
-    preview_map = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=13,
-        tiles='CartoDB positron'
-    )
-    
-    # Add study area
-    folium.GeoJson(
-        study_area,
-        style_function=lambda x: {
-            'fillColor': 'lightblue',
-            'color': 'blue',
-            'weight': 3,
-            'fillOpacity': 0.2
-        }
-    ).add_to(preview_map)
-    
-    # Add major stations
-    for idx, station in major_stations.iterrows():
-        folium.Marker(
-            [station.geometry.y, station.geometry.x],
-            popup=station['name'],
-            tooltip=station['name'],
-            icon=folium.Icon(color='red', icon='train', prefix='fa')
-        ).add_to(preview_map)
-    
-    st_folium(preview_map, width=700, height=400)
+    preview_html = build_preview_map_html((center_lat, center_lon), study_area, major_stations)
+    components.html(preview_html, width=700, height=400)
     
     # Statistics
     st.markdown("### 📊 Network Statistics")
@@ -606,9 +749,9 @@ else:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Network Nodes", f"{len(G.nodes):,}")
+        st.metric("Network Nodes", f"{len(network['node_ids']):,}")
     with col2:
-        st.metric("Network Edges", f"{len(G.edges):,}")
+        st.metric("Network Edges", f"{network['n_edges']:,}")
     with col3:
         st.metric("Transit Stations", len(major_stations))
 